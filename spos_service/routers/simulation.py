@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import FileResponse
 from spos_service.services.monte_carlo import monte_carlo_simulation
 from spos_service.services.pricing import calculate_dynamic_pricing_with_forecast
 from spos_service.services.validate import dynamic_pricing_validate, monte_carlo_simulation_validate
+from spos_service.utils import profiling
 
 router = APIRouter(
     prefix="/simulate",
@@ -9,14 +11,12 @@ router = APIRouter(
 )
 
 @router.get("/monte-carlo")
-async def calc_monte_carlo_simulation(simulation_runs: int = Query(1, description="Number of simulation runs to perform: 1 equals 140 runs"), max_weekly_hours: int = 180, min_weekly_hours: int = 140, open_days: int=None):
-    result = monte_carlo_simulation(simulation_runs, max_weekly_hours=max_weekly_hours, min_weekly_hours=min_weekly_hours,open_days=open_days)
-    return {"result": result}
+async def calc_monte_carlo_simulation(simulation_runs: int = Query(1, description="Number of simulation runs to perform: 1 equals 140 runs"), max_weekly_hours: int = 180, min_weekly_hours: int = 140, open_days: int=None, profile: bool = Query(False, description="Profile this call (requires SPOS_PROFILING_ENABLED)"), x_spos_profile: bool = Header(False)):
+    return run_simulation(profile or x_spos_profile, monte_carlo_simulation, simulation_runs, max_weekly_hours=max_weekly_hours, min_weekly_hours=min_weekly_hours,open_days=open_days)
 
 @router.get("/dynamic-pricing")
-async def dynamic_pricing():
-    result = calculate_dynamic_pricing_with_forecast(forecast_days=7)
-    return {"result": result}
+async def dynamic_pricing(profile: bool = Query(False, description="Profile this call (requires SPOS_PROFILING_ENABLED)"), x_spos_profile: bool = Header(False)):
+    return run_simulation(profile or x_spos_profile, calculate_dynamic_pricing_with_forecast, forecast_days=7)
 
 @router.get("/monte-carlo-validate")
 async def calc_monte_carlo_simulation_validate():
@@ -26,4 +26,35 @@ async def calc_monte_carlo_simulation_validate():
 @router.get("/dynamic-pricing-validate")
 async def calc_dynamic_pricing_validate():
     result = dynamic_pricing_validate()
-    return {"result": result}
\ No newline at end of file
+    return {"result": result}
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str):
+    if not profiling.PROFILING_ENABLED:
+        raise HTTPException(status_code=403, detail="Profiling is disabled.")
+    path = profiling.get_profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}.prof")
+
+def run_simulation(profile, func, *args, **kwargs):
+    """
+    Run a simulation and optionally attach a cProfile summary to the response.
+
+    Args:
+        profile (bool): Whether profiling was requested via query flag or X-SPOS-Profile header.
+        func (callable): Simulation function to run.
+
+    Returns:
+        dict: Simulation result, plus the profile summary and download url if profiled.
+    """
+    if not profile:
+        return {"result": func(*args, **kwargs)}
+    if not profiling.PROFILING_ENABLED:
+        raise HTTPException(status_code=403, detail="Profiling is disabled.")
+    try:
+        result, summary = profiling.profile_call(func, *args, **kwargs)
+    except profiling.ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    summary["download_url"] = str(router.url_path_for("download_profile", profile_id=summary["profile_id"]))
+    return {"result": result, "profile": summary}
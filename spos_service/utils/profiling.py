@@ -0,0 +1,171 @@
+import cProfile
+import os
+import pstats
+import re
+import tempfile
+import threading
+import uuid
+
+# Profiling settings (opt-in, disabled unless configured)
+PROFILING_ENABLED = os.getenv("SPOS_PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILE_DIR = os.getenv("SPOS_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "spos_profiles"))
+PROFILE_MAX_FILES = int(os.getenv("SPOS_PROFILE_MAX_FILES", "50"))
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+# Only one profiler can be active per interpreter
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when another request is already being profiled."""
+
+
+def profile_call(func, *args, top=25, tree_depth=4, tree_width=5, **kwargs):
+    """
+    Run a function under cProfile and store the profile as a .prof file.
+
+    Args:
+        func (callable): Function to profile.
+        *args: Positional arguments passed to func.
+        top (int): Number of functions to list in the summary, sorted by cumulative time.
+        tree_depth (int): Maximum depth of the call tree in the summary.
+        tree_width (int): Maximum number of children per call tree node.
+        **kwargs: Keyword arguments passed to func.
+
+    Returns:
+        tuple: Result of func and a dict with the profile id and call-tree summary.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("Another request is currently being profiled.")
+    try:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+    finally:
+        _profile_lock.release()
+
+    profile_id = uuid.uuid4().hex
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profiler.dump_stats(os.path.join(PROFILE_DIR, f"{profile_id}.prof"))
+    prune_profiles()
+
+    stats = pstats.Stats(profiler)
+    summary = {
+        "profile_id": profile_id,
+        "total_time": round(stats.total_tt, 4),
+        "top_functions": summarize_top_functions(stats, top),
+        "call_tree": build_call_tree(stats, func, tree_depth, tree_width),
+    }
+    return result, summary
+
+
+def summarize_top_functions(stats, top=25):
+    """
+    List the most expensive functions of a profile.
+
+    Args:
+        stats (pstats.Stats): Collected profile statistics.
+        top (int): Number of functions to return.
+
+    Returns:
+        list: Functions sorted by cumulative time.
+    """
+    entries = []
+    for key, (cc, nc, tt, ct, callers) in stats.stats.items():
+        entries.append({
+            "function": format_function(key),
+            "calls": nc,
+            "total_time": round(tt, 4),
+            "cumulative_time": round(ct, 4),
+        })
+    entries.sort(key=lambda entry: entry["cumulative_time"], reverse=True)
+    return entries[:top]
+
+
+def build_call_tree(stats, func, max_depth=4, max_children=5):
+    """
+    Build a call tree starting at the profiled function.
+
+    Args:
+        stats (pstats.Stats): Collected profile statistics.
+        func (callable): The profiled entry function.
+        max_depth (int): Maximum depth of the tree.
+        max_children (int): Maximum number of children per node, sorted by cumulative time.
+
+    Returns:
+        dict: Nested call tree, or None if the entry function was not recorded.
+    """
+    # pstats only stores callers, so invert them to get callees per function
+    callees = {}
+    for key, (cc, nc, tt, ct, callers) in stats.stats.items():
+        for caller, caller_stats in callers.items():
+            callees.setdefault(caller, {})[key] = caller_stats
+
+    code = getattr(func, "__code__", None)
+    root = next(
+        (key for key in stats.stats if code and key == (code.co_filename, code.co_firstlineno, code.co_name)),
+        None
+    )
+    if root is None:
+        return None
+
+    def build_node(key, calls, cumulative_time, depth, path):
+        node = {
+            "function": format_function(key),
+            "calls": calls,
+            "cumulative_time": round(cumulative_time, 4),
+        }
+        if depth < max_depth:
+            children = sorted(callees.get(key, {}).items(), key=lambda item: item[1][3], reverse=True)
+            node["children"] = [
+                build_node(child, child_stats[1], child_stats[3], depth + 1, path | {child})
+                for child, child_stats in children[:max_children]
+                if child not in path  # Skip recursion
+            ]
+        return node
+
+    cc, nc, tt, ct, callers = stats.stats[root]
+    return build_node(root, nc, ct, 0, {root})
+
+
+def format_function(key):
+    """
+    Format a pstats function key as "file:line(name)".
+    """
+    filename, line, name = key
+    return f"{os.path.basename(filename)}:{line}({name})" if line else name
+
+
+def get_profile_path(profile_id):
+    """
+    Resolve the path of a stored profile.
+
+    Args:
+        profile_id (str): Id returned by profile_call.
+
+    Returns:
+        str: Path to the .prof file, or None if the id is invalid or unknown.
+    """
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.prof")
+    return path if os.path.isfile(path) else None
+
+
+def prune_profiles():
+    """
+    Delete the oldest stored profiles above PROFILE_MAX_FILES.
+    """
+    files = [
+        os.path.join(PROFILE_DIR, name) for name in os.listdir(PROFILE_DIR) if name.endswith(".prof")
+    ]
+    files.sort(key=os.path.getmtime)
+    for path in files[:max(0, len(files) - PROFILE_MAX_FILES)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass